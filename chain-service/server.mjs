@@ -8,10 +8,70 @@ const PORT = Number(process.env.CHAIN_SERVICE_PORT || "8790");
 function normalizeRpcUrl(rpcUrl) {
   if (typeof rpcUrl !== "string" || !rpcUrl) return rpcUrl;
   if (rpcUrl.startsWith("http://") || rpcUrl.startsWith("https://")) return rpcUrl;
+  if (rpcUrl.startsWith("ws://") || rpcUrl.startsWith("wss://")) return rpcUrl;
   // Most public RPC endpoints are https.
   return `https://${rpcUrl}`;
 }
 
+// One provider per RPC URL, reused across requests, so the node connection and
+// the detected network are kept instead of being rebuilt for every tx.
+// ws:// / wss:// URLs get a persistent websocket; anything else stays on HTTP.
+// rpc_url comes from the request (including LLM-generated commands), so the cache
+// is bounded: past MAX_PROVIDERS the least recently used entry is dropped.
+const MAX_PROVIDERS = 16;
+const providers = new Map(); // rpcUrl -> { provider, ready }, least recently used first
+
+function dropProvider(rpcUrl, entry) {
+  if (providers.get(rpcUrl) !== entry) return;
+  providers.delete(rpcUrl);
+  // HTTP providers hold nothing open; a websocket must be closed explicitly.
+  if (entry.provider instanceof ethers.WebSocketProvider) entry.provider.destroy();
+}
+
+function openWebSocketProvider(rpcUrl) {
+  const provider = new ethers.WebSocketProvider(rpcUrl);
+  const entry = { provider, ready: null };
+  entry.ready = new Promise((resolve, reject) => {
+    const ws = provider.websocket;
+    ws.addEventListener("open", () => resolve());
+    // Without an error listener a refused or unresolvable URL crashes the service.
+    ws.addEventListener("error", (event) => {
+      dropProvider(rpcUrl, entry);
+      reject(new Error(`RPC websocket error (${rpcUrl}): ${event?.message || "connection failed"}`));
+    });
+    // ethers does not reconnect; drop it so the next request opens a fresh socket.
+    ws.addEventListener("close", () => {
+      dropProvider(rpcUrl, entry);
+      reject(new Error(`RPC websocket closed (${rpcUrl})`));
+    });
+  });
+  // Awaited by the request that opened it; later failures only need the eviction above.
+  entry.ready.catch(() => {});
+  return entry;
+}
+
+function getProvider(rpcUrl) {
+  let entry = providers.get(rpcUrl);
+  if (entry) {
+    providers.delete(rpcUrl);
+    providers.set(rpcUrl, entry);
+    return entry;
+  }
+  if (rpcUrl.startsWith("ws://") || rpcUrl.startsWith("wss://")) {
+    entry = openWebSocketProvider(rpcUrl);
+  } else {
+    // staticNetwork: true -> detect the chain id once, not before every call.
+    const provider = new ethers.JsonRpcProvider(rpcUrl, undefined, { staticNetwork: true });
+    entry = { provider, ready: Promise.resolve() };
+  }
+  providers.set(rpcUrl, entry);
+  if (providers.size > MAX_PROVIDERS) {
+    const [oldestUrl, oldest] = providers.entries().next().value;
+    dropProvider(oldestUrl, oldest);
+  }
+  return entry;
+}
+
 function json(res, status, body) {
   res.statusCode = status;
   res.setHeader("content-type", "application/json; charset=utf-8");
@@ -40,7 +100,8 @@ async function handleExecute(payload) {
   const rpcUrl = normalizeRpcUrl(payload?.rpc_url || process.env.RPC_URL);
   if (!rpcUrl) throw new Error("Missing rpc_url (or env RPC_URL)");
 
-  const provider = new ethers.JsonRpcProvider(rpcUrl);
+  const { provider, ready } = getProvider(rpcUrl);
+  await ready;
   const expectedChainId =
     payload?.expected_chain_id ?? process.env.EXPECTED_CHAIN_ID ?? null;
   if (expectedChainId) {
@@ -1,34 +1,40 @@
+import asyncio
 import hmac
 import hashlib
 import json
-import os
 import re
 import secrets
 import time
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+import msgspec
+import orjson
 from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi import WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-
-from chain_client import chain_execute
-from openmind_client import chat_completions, get_openmind_api_key
-from speech import speak
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from chain_client import chain_execute, close_chain_client, start_chain_client
+from config import CFG
+from jsonutil import dumps as json_dumps, loads as json_loads
+from openmind_client import (
+    chat_completions,
+    chat_completions_stream,
+    close_openmind_client,
+    get_openmind_api_key,
+    start_openmind_client,
+)
+from speech import speak, speak_in_order, speak_many
 from test_sentences import TEST_SENTENCES
 
-EXECUTOR_SHARED_SECRET = os.getenv("EXECUTOR_SHARED_SECRET", "")
-EXECUTOR_CHAIN_LOCAL_TOKEN = os.getenv("EXECUTOR_CHAIN_LOCAL_TOKEN", "")
-DEFAULT_RPC_URL = (os.getenv("DEFAULT_RPC_URL") or "https://rpc.testnet.arc.network").strip()
-DEFAULT_CHAIN_ID = int(os.getenv("DEFAULT_CHAIN_ID") or "5042002")
-DEFAULT_USDC_ADDRESS = (os.getenv("DEFAULT_USDC_ADDRESS") or "0x3600000000000000000000000000000000000000").strip()
-EXECUTOR_ENABLE_CHAIN_FROM_GATEWAY = (os.getenv("EXECUTOR_ENABLE_CHAIN_FROM_GATEWAY") or "false").lower() in (
-    "1",
-    "true",
-    "yes",
-)
+_EXECUTOR_SHARED_SECRET_BYTES = CFG.executor_shared_secret.encode("utf-8")
 
-app = FastAPI(title="OpenMind Local Executor", version="0.1.0")
+app = FastAPI(title="OpenMind Local Executor", version="0.1.0", default_response_class=ORJSONResponse)
+app.add_event_handler("startup", start_chain_client)
+app.add_event_handler("startup", start_openmind_client)
+app.add_event_handler("shutdown", close_chain_client)
+app.add_event_handler("shutdown", close_openmind_client)
 
 # Allow the web UI (often hosted on a different origin like Vercel) to call local executor endpoints.
 # This is intentionally permissive for local sandbox/demo usage.
@@ -40,11 +46,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-X402_STATE_PATH = (os.getenv("X402_STATE_PATH") or str(Path(__file__).resolve().parent / ".x402_sandbox_state.json")).strip()
-
 
 def _load_x402_state() -> Dict[str, Any]:
-    p = Path(X402_STATE_PATH)
+    p = Path(CFG.x402_state_path)
     if not p.exists():
         # Create a fresh sandbox wallet with some initial balance (demo only)
         state = {
@@ -74,7 +78,7 @@ def _load_x402_state() -> Dict[str, Any]:
 
 
 def _save_x402_state(state: Dict[str, Any]) -> None:
-    p = Path(X402_STATE_PATH)
+    p = Path(CFG.x402_state_path)
     p.write_text(json.dumps(state, ensure_ascii=False, indent=2), encoding="utf-8")
 
 
@@ -175,16 +179,33 @@ async def x402_pay(req: Request):
     return {"ok": True, "sandbox": True, "payment": payment, "balance_usdc": s["balance_usdc"]}
 
 
-def _hmac_sha256_hex(secret: str, data: str) -> str:
-    return hmac.new(secret.encode("utf-8"), data.encode("utf-8"), hashlib.sha256).hexdigest()
+def _hmac_sha256(secret: bytes, timestamp: str, body: bytes) -> bytes:
+    # Digest of f"{timestamp}.{body}", fed piecewise so the raw body is never copied or decoded.
+    h = hmac.new(secret, timestamp.encode("utf-8"), hashlib.sha256)
+    h.update(b".")
+    h.update(body)
+    return h.digest()
+
+
+# hexdigest() form only: bytes.fromhex alone would also accept uppercase and spaces.
+_SIGNATURE_HEX_RE = re.compile(r"[0-9a-f]{64}")
+
 
+def _signature_matches(expected: bytes, signature_hex: str) -> bool:
+    if not _SIGNATURE_HEX_RE.fullmatch(signature_hex):
+        return False
+    return hmac.compare_digest(expected, bytes.fromhex(signature_hex))
 
-def _safe_equal(a: str, b: str) -> bool:
-    return hmac.compare_digest(a.encode("utf-8"), b.encode("utf-8"))
 
-_ADDR_RE = re.compile(r"(0x[a-fA-F0-9]{40})")
-_AMOUNT_RE = re.compile(r"([0-9]+(?:\.[0-9]+)?)")
-_TIMES_RE = re.compile(r"(?:转|转账)\s*([0-9]{1,4})\s*次")
+# One alternation so a message is scanned once. Order matters: an address or a
+# "转 N 次" clause is consumed whole, so its digits are never taken as the amount.
+_CN_TRANSFER_RE = re.compile(
+    r"(?P<addr>0x[a-fA-F0-9]{40})"
+    r"|(?:转|转账)\s*(?P<times>[0-9]{1,4})\s*次"
+    r"|(?P<amount>[0-9]+(?:\.[0-9]+)?)"
+    r"|(?P<usdc>(?i:usdc))"
+    r"|(?P<eth>(?i:eth)|原生|主币)"
+)
 
 
 def _parse_cn_transfer(text: str) -> Optional[Dict[str, Any]]:
@@ -195,46 +216,56 @@ def _parse_cn_transfer(text: str) -> Optional[Dict[str, Any]]:
       - 转 1 USDC 到 0xabc...
       - 转账 0.5 usdc 给 0xabc...
       - 转 0.001 ETH 到 0xabc...
+      - 转 10 次 0.1 USDC 到 0xabc...
     """
 
     t = text.strip()
-    if not t:
+    # Every transfer needs a 0x address; most chat lines don't have one, so
+    # bail out with a C-level substring check before running the regex.
+    if "0x" not in t:
         return None
 
+    addrs: list[str] = []
+    times: Optional[int] = None
+    amount: Optional[str] = None
+    is_usdc = False
+    is_eth = False
+    for m in _CN_TRANSFER_RE.finditer(t):
+        kind = m.lastgroup
+        if kind == "addr":
+            addrs.append(m.group(kind))
+        elif kind == "times":
+            if times is None:
+                times = max(1, int(m.group(kind)))
+        elif kind == "amount":
+            if amount is None:
+                amount = m.group(kind)
+        elif kind == "usdc":
+            is_usdc = True
+        else:
+            is_eth = True
+
     # Addresses: allow "from -> to" if user provides two addresses
-    addrs = _ADDR_RE.findall(t)
     if not addrs:
         return None
     to = addrs[-1]
     from_addr = addrs[0] if len(addrs) >= 2 else None
 
     # Optional: how many times
-    times = 1
-    m_times = _TIMES_RE.search(t)
-    if m_times:
-        try:
-            times = max(1, int(m_times.group(1)))
-        except Exception:
-            times = 1
+    times = times or 1
 
     # Must contain a number (amount)
-    m_amt = _AMOUNT_RE.search(t)
-    if not m_amt:
+    if amount is None:
         return None
-    amount = m_amt.group(1)
-
-    lower = t.lower()
-    is_usdc = "usdc" in lower
-    is_eth = ("eth" in lower) or ("原生" in t) or ("主币" in t)
 
     if is_usdc:
         # If user provided a source address, use transferFrom (relayer spends allowance)
         if from_addr:
             return {
                 "type": "transfer_from_erc20",
-                "rpc_url": DEFAULT_RPC_URL,
-                "expected_chain_id": DEFAULT_CHAIN_ID,
-                "token_address": DEFAULT_USDC_ADDRESS,
+                "rpc_url": CFG.default_rpc_url,
+                "expected_chain_id": CFG.default_chain_id,
+                "token_address": CFG.default_usdc_address,
                 "from": from_addr,
                 "to": to,
                 "amount": amount,
@@ -243,9 +274,9 @@ def _parse_cn_transfer(text: str) -> Optional[Dict[str, Any]]:
             }
         return {
             "type": "transfer_erc20",
-            "rpc_url": DEFAULT_RPC_URL,
-            "expected_chain_id": DEFAULT_CHAIN_ID,
-            "token_address": DEFAULT_USDC_ADDRESS,
+            "rpc_url": CFG.default_rpc_url,
+            "expected_chain_id": CFG.default_chain_id,
+            "token_address": CFG.default_usdc_address,
             "to": to,
             "amount": amount,
             "decimals": 6,
@@ -255,8 +286,8 @@ def _parse_cn_transfer(text: str) -> Optional[Dict[str, Any]]:
     if is_eth:
         return {
             "type": "transfer_native",
-            "rpc_url": DEFAULT_RPC_URL,
-            "expected_chain_id": DEFAULT_CHAIN_ID,
+            "rpc_url": CFG.default_rpc_url,
+            "expected_chain_id": CFG.default_chain_id,
             "to": to,
             "amount_eth": amount,
             "times": times,
@@ -266,6 +297,10 @@ def _parse_cn_transfer(text: str) -> Optional[Dict[str, Any]]:
     return {"_needs_token": True, "to": to, "amount": amount}
 
 
+def _typed_commands(items: list) -> list[Dict[str, Any]]:
+    return [c for c in items if isinstance(c, dict) and isinstance(c.get("type"), str)]
+
+
 def _extract_commands(openmind_response: Any) -> list[Dict[str, Any]]:
     """
     Best-effort extractor for OM1/OpenMind style command outputs.
@@ -276,44 +311,47 @@ def _extract_commands(openmind_response: Any) -> list[Dict[str, Any]]:
     - OpenAI-like: {"choices":[{"message":{"content":"..."}}]}  (JSON list or JSON object in content)
     """
 
-    if not openmind_response:
+    if not isinstance(openmind_response, dict):
         return []
 
-    if isinstance(openmind_response, dict):
-        cmds = openmind_response.get("commands")
-        if isinstance(cmds, list):
-            out: list[Dict[str, Any]] = []
-            for c in cmds:
-                if isinstance(c, dict) and isinstance(c.get("type"), str):
-                    out.append(c)
-            return out
+    cmds = openmind_response.get("commands")
+    if isinstance(cmds, list):
+        return _typed_commands(cmds)
 
-        # OpenAI-ish message.content that might contain JSON
-        try:
-            content = (
-                openmind_response.get("choices", [{}])[0]
-                .get("message", {})
-                .get("content", None)
-            )
-        except Exception:
-            content = None
-        if isinstance(content, str) and content.strip():
-            s = content.strip()
-            # If model returned JSON in plain text, try parse.
-            try:
-                parsed = json.loads(s)
-            except Exception:
-                return []
-            if isinstance(parsed, list):
-                return [c for c in parsed if isinstance(c, dict) and isinstance(c.get("type"), str)]
-            if isinstance(parsed, dict) and isinstance(parsed.get("type"), str):
-                return [parsed]
-            if isinstance(parsed, dict) and isinstance(parsed.get("commands"), list):
-                return [c for c in parsed["commands"] if isinstance(c, dict) and isinstance(c.get("type"), str)]
+    # OpenAI-ish message.content that might contain JSON
+    choices = openmind_response.get("choices")
+    if not isinstance(choices, list) or not choices or not isinstance(choices[0], dict):
+        return []
+    message = choices[0].get("message")
+    content = message.get("content") if isinstance(message, dict) else None
+    if not isinstance(content, str):
+        return []
 
+    # Only JSON arrays/objects can hold commands; skip the parse for plain-text replies.
+    s = content.strip()
+    if not s or s[0] not in "[{":
+        return []
+    try:
+        parsed = json_loads(s)
+    except ValueError:
+        return []
+
+    if isinstance(parsed, list):
+        return _typed_commands(parsed)
+    if isinstance(parsed, dict):
+        if isinstance(parsed.get("type"), str):
+            return [parsed]
+        inner = parsed.get("commands")
+        if isinstance(inner, list):
+            return _typed_commands(inner)
     return []
 
 
+# chain-service types that only read chain state (see chain-service/server.mjs).
+_CHAIN_READ_ONLY_TYPES = ("get_code", "erc20_metadata")
+_CHAIN_BATCH_CONCURRENCY = 8
+
+
 async def _execute_chain_command(value: Any) -> Dict[str, Any]:
     """
     Execute a chain command where value is either:
@@ -324,31 +362,87 @@ async def _execute_chain_command(value: Any) -> Dict[str, Any]:
     payload: Any = value
     if isinstance(payload, str):
         try:
-            payload = json.loads(payload)
+            payload = json_loads(payload)
         except Exception:
             return {"ok": False, "error": "chain_execute value must be JSON object or JSON string"}
+    elif isinstance(payload, dict):
+        # The caller's dict is echoed back as the command "input"; keep it intact.
+        payload = dict(payload)
     if not isinstance(payload, dict):
         return {"ok": False, "error": "chain_execute payload must be an object"}
 
-    # Support batch execution if payload includes "times"
-    times = int(payload.get("times") or 1)
+    # Support batch execution if payload includes "times"; the rest is sent as-is each time.
+    times = int(payload.pop("times", None) or 1)
     times = max(1, min(times, 50))
-    base = dict(payload)
-    base.pop("times", None)
 
-    results = []
-    for i in range(times):
-        r = await chain_execute(base)
-        results.append({"index": i + 1, "total": times, "result": r})
+    if payload.get("type") in _CHAIN_READ_ONLY_TYPES:
+        # Reads don't consume a nonce, so they can overlap (bounded to spare the RPC).
+        sem = asyncio.Semaphore(_CHAIN_BATCH_CONCURRENCY)
+
+        async def _one() -> Dict[str, Any]:
+            async with sem:
+                return await chain_execute(payload)
+
+        outputs = await asyncio.gather(*(_one() for _ in range(times)))
+    else:
+        # Writes stay sequential: chain-service picks the wallet's next nonce per request.
+        outputs = []
+        for _ in range(times):
+            outputs.append(await chain_execute(payload))
+
+    results = [{"index": i + 1, "total": times, "result": r} for i, r in enumerate(outputs)]
     return {"ok": True, "times": times, "results": results}
 
 
+def _ws_frame(data: Any) -> str:
+    # Same wire format as ws.send_json (compact, non-ASCII kept).
+    return json_dumps(data).decode("utf-8")
+
+
+async def _ws_send_json(ws: WebSocket, data: Any) -> None:
+    await ws.send_text(_ws_frame(data))
+
+
+# Frames whose content never changes at runtime are encoded once at import.
+_WS_HELLO_MESSAGE = (
+    "已连接。你可以直接中文对话，或发送 JSON 指令。\n"
+    "例：转 1 USDC 到 0x...\n"
+    "或：{\"type\":\"chat\",\"text\":\"...\"} / {\"type\":\"chain_execute\",\"payload\":{...}}"
+)
+_WS_HELLO_CHAT_FRAME = _ws_frame({"type": "hello", "message": _WS_HELLO_MESSAGE, "chat_enabled": True})
+_WS_HELLO_NO_CHAT_FRAME = _ws_frame({"type": "hello", "message": _WS_HELLO_MESSAGE, "chat_enabled": False})
+_WS_TESTS_FRAME = _ws_frame({"type": "tests", "sentences": TEST_SENTENCES})
+_WS_SPOKEN_TESTS_FRAME = _ws_frame({"type": "spoken_batch", "texts": TEST_SENTENCES})
+_WS_DONE_FRAME = _ws_frame({"type": "done"})
+
+# Hot per-item frames: only a few values change, so fill them into fixed text.
+_WS_PROGRESS_TEMPLATE = '{{"type":"progress","index":{0},"total":{1}}}'
+
+
+def _ws_spoken_frame(text: str) -> str:
+    # orjson.dumps(str) yields the quoted, escaped JSON string to embed as-is.
+    return '{"type":"spoken","text":' + orjson.dumps(text).decode("utf-8") + "}"
+
+
 @app.get("/healthz")
 def healthz():
     return {"ok": True}
 
 
-@app.post("/execute")
+class ExecuteBody(msgspec.Struct):
+    """Fields of the signed gateway body the executor reads; other keys are ignored."""
+
+    openmind_status: Any = None
+    openmind_response: Any = None
+    confirmed: Any = None
+
+
+_EXECUTE_BODY_DECODER = msgspec.json.Decoder(ExecuteBody)
+
+
+# Routes that echo caller-supplied data use JSONResponse: it handles integers beyond
+# 64 bits (e.g. wei amounts), which ORJSONResponse rejects.
+@app.post("/execute", response_class=JSONResponse)
 async def execute(
     req: Request,
     x_om_timestamp: Optional[str] = Header(default=None),
@@ -363,7 +457,7 @@ async def execute(
     Where payload_json is the exact raw JSON string sent as body (no re-serialization).
     """
 
-    if not EXECUTOR_SHARED_SECRET:
+    if not CFG.executor_shared_secret:
         raise HTTPException(
             status_code=500,
             detail="EXECUTOR_SHARED_SECRET is not set on executor.",
@@ -372,29 +466,26 @@ async def execute(
         raise HTTPException(status_code=401, detail="Missing signature headers.")
 
     raw = await req.body()
-    try:
-        payload_str = raw.decode("utf-8")
-    except Exception:
-        raise HTTPException(status_code=400, detail="Body must be UTF-8 JSON.")
-
-    expected = _hmac_sha256_hex(EXECUTOR_SHARED_SECRET, f"{x_om_timestamp}.{payload_str}")
-    if not _safe_equal(expected, x_om_signature):
+    expected = _hmac_sha256(_EXECUTOR_SHARED_SECRET_BYTES, x_om_timestamp, raw)
+    if not _signature_matches(expected, x_om_signature):
         raise HTTPException(status_code=401, detail="Invalid signature.")
 
+    # Decoded straight from bytes into the fields we use. Invalid UTF-8 inside those fields
+    # raises UnicodeDecodeError rather than DecodeError; keys we skip are not validated.
     try:
-        payload: Dict[str, Any] = json.loads(payload_str)
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid JSON body.")
+        payload = _EXECUTE_BODY_DECODER.decode(raw)
+    except (msgspec.DecodeError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Body must be a UTF-8 JSON object.")
 
     # ---- TODO: Map OpenMind output to robot actions here ----
     # For MVP, we just log/return the payload.
     # If you already run OM1 locally, this is where you'd call your action layer (move/speak/etc.).
-    openmind_status = payload.get("openmind_status")
-    openmind_response = payload.get("openmind_response")
+    openmind_status = payload.openmind_status
+    openmind_response = payload.openmind_response
 
     executed: list[Dict[str, Any]] = []
-    confirmed = bool(payload.get("confirmed"))
-    if confirmed or EXECUTOR_ENABLE_CHAIN_FROM_GATEWAY:
+    confirmed = bool(payload.confirmed)
+    if confirmed or CFG.enable_chain_from_gateway:
         cmds = _extract_commands(openmind_response)
         for c in cmds:
             ctype = c.get("type")
@@ -418,7 +509,7 @@ async def execute(
     }
 
 
-@app.post("/chain/execute")
+@app.post("/chain/execute", response_class=JSONResponse)
 async def chain_execute_http(
     req: Request,
     x_local_token: Optional[str] = Header(default=None),
@@ -432,8 +523,8 @@ async def chain_execute_http(
       x-local-token: some-secret
     """
 
-    if EXECUTOR_CHAIN_LOCAL_TOKEN:
-        if not x_local_token or x_local_token != EXECUTOR_CHAIN_LOCAL_TOKEN:
+    if CFG.executor_chain_local_token:
+        if not x_local_token or x_local_token != CFG.executor_chain_local_token:
             raise HTTPException(status_code=401, detail="Invalid x-local-token.")
 
     try:
@@ -447,6 +538,128 @@ async def chain_execute_http(
     return {"ok": True, "chain_result": result}
 
 
+async def _ws_handle_tests(ws: WebSocket, obj: Dict[str, Any]) -> None:
+    await ws.send_text(_WS_TESTS_FRAME)
+
+
+async def _ws_handle_run_tests(ws: WebSocket, obj: Dict[str, Any]) -> None:
+    # Speak them in order (best-effort). This is purely for local debugging.
+    # Report them in one frame instead of one "spoken" frame per sentence.
+    speak_many(TEST_SENTENCES)
+    await ws.send_text(_WS_SPOKEN_TESTS_FRAME)
+    await ws.send_text(_WS_DONE_FRAME)
+
+
+async def _ws_handle_chain_execute(ws: WebSocket, obj: Dict[str, Any]) -> None:
+    payload = obj.get("payload")
+    if not isinstance(payload, dict):
+        await _ws_send_json(
+            ws,
+            {
+                "type": "error",
+                "error": "Missing payload (object). Use {\"type\":\"chain_execute\",\"payload\":{...}}",
+            }
+        )
+        return
+    result = await chain_execute(payload)
+    await _ws_send_json(ws, {"type": "chain_result", "result": result})
+
+
+# Where a streamed reply can be cut for speaking: CJK/ASCII terminators, or a
+# period followed by whitespace (so "3.14" is not split).
+_SENTENCE_END_RE = re.compile(r"[。！？!?\n]|\.(?=\s)")
+
+
+async def _ws_stream_chat(ws: WebSocket, api_key: str, body: Dict[str, Any]) -> tuple[Dict[str, Any], bool]:
+    """
+    Stream a chat reply, speaking each complete sentence as soon as it arrives.
+    Returns the chat result and whether anything was spoken.
+    """
+
+    pending = ""
+    spoke = False
+
+    async def _say(sentence: str) -> None:
+        nonlocal spoke
+        sentence = sentence.strip()
+        if sentence:
+            spoke = True
+            speak_in_order(sentence)
+            await ws.send_text(_ws_spoken_frame(sentence))
+
+    async def _on_text(delta: str) -> None:
+        nonlocal pending
+        pending += delta
+        cut = -1
+        for m in _SENTENCE_END_RE.finditer(pending):
+            cut = m.end()
+        if cut > 0:
+            await _say(pending[:cut])
+            pending = pending[cut:]
+
+    result = await chat_completions_stream(api_key=api_key, body=body, on_text=_on_text)
+    await _say(pending)
+    return result, spoke
+
+
+async def _ws_handle_chat(ws: WebSocket, obj: Dict[str, Any]) -> None:
+    text = str(obj.get("text") or "").strip()
+    if not text:
+        await _ws_send_json(ws, {"type": "error", "error": "Missing text"})
+        return
+
+    api_key = get_openmind_api_key()
+    if not api_key:
+        await _ws_send_json(
+            ws,
+            {
+                "type": "error",
+                "error": "Chat disabled: set OM_API_KEY on the executor machine.",
+            }
+        )
+        return
+
+    # Minimal OpenAI-compatible body; you can expand this to match your config.
+    body = {
+        "model": obj.get("model") or "gpt-4.1-mini",
+        "messages": [
+            {"role": "system", "content": obj.get("system") or "You are a helpful robot."},
+            {"role": "user", "content": text},
+        ],
+    }
+    if obj.get("stream"):
+        result, spoke = await _ws_stream_chat(ws, api_key, body)
+        await _ws_send_json(ws, {"type": "openmind_result", "result": result})
+        if spoke:
+            return
+        # Nothing was streamed (error, or a plain JSON reply): handle it like a normal reply.
+    else:
+        result = await chat_completions(api_key=api_key, body=body)
+        await _ws_send_json(ws, {"type": "openmind_result", "result": result})
+
+    # Best-effort extract assistant text
+    assistant_text = ""
+    try:
+        assistant_text = (
+            result["data"]["choices"][0]["message"]["content"]  # type: ignore[index]
+        )
+    except Exception:
+        assistant_text = json_dumps(result["data"]).decode("utf-8")
+
+    if assistant_text:
+        speak(assistant_text)
+        await ws.send_text(_ws_spoken_frame(assistant_text))
+
+
+# JSON messages by "type"; anything else falls through to the plain-text handling in ws_conversation.
+_WS_JSON_HANDLERS = {
+    "tests": _ws_handle_tests,
+    "run_tests": _ws_handle_run_tests,
+    "chain_execute": _ws_handle_chain_execute,
+    "chat": _ws_handle_chat,
+}
+
+
 @app.websocket("/ws")
 async def ws_conversation(ws: WebSocket):
     """
@@ -463,92 +676,35 @@ async def ws_conversation(ws: WebSocket):
     await ws.accept()
     try:
         pending_chain_payload: Optional[Dict[str, Any]] = None
-        await ws.send_json(
-            {
-                "type": "hello",
-                "message": "已连接。你可以直接中文对话，或发送 JSON 指令。\n"
-                "例：转 1 USDC 到 0x...\n"
-                "或：{\"type\":\"chat\",\"text\":\"...\"} / {\"type\":\"chain_execute\",\"payload\":{...}}",
-                "chat_enabled": bool(get_openmind_api_key()),
-            }
-        )
+        await ws.send_text(_WS_HELLO_CHAT_FRAME if get_openmind_api_key() else _WS_HELLO_NO_CHAT_FRAME)
         while True:
-            msg = await ws.receive_text()
-
-            # Allow either raw text (speak) or JSON messages
-            try:
-                obj = json.loads(msg)
-            except Exception:
-                obj = None
-
-            if obj and isinstance(obj, dict) and obj.get("type") == "tests":
-                await ws.send_json({"type": "tests", "sentences": TEST_SENTENCES})
-                continue
-
-            if obj and isinstance(obj, dict) and obj.get("type") == "run_tests":
-                # Speak them in order (best-effort). This is purely for local debugging.
-                for s in TEST_SENTENCES:
-                    speak(s)
-                    await ws.send_json({"type": "spoken", "text": s})
-                await ws.send_json({"type": "done"})
-                continue
-
-            if obj and isinstance(obj, dict) and obj.get("type") == "chain_execute":
-                payload = obj.get("payload")
-                if not isinstance(payload, dict):
-                    await ws.send_json(
-                        {
-                            "type": "error",
-                            "error": "Missing payload (object). Use {\"type\":\"chain_execute\",\"payload\":{...}}",
-                        }
-                    )
-                    continue
-                result = await chain_execute(payload)
-                await ws.send_json({"type": "chain_result", "result": result})
-                continue
-
-            if obj and isinstance(obj, dict) and obj.get("type") == "chat":
-                text = str(obj.get("text") or "").strip()
-                if not text:
-                    await ws.send_json({"type": "error", "error": "Missing text"})
-                    continue
-
-                api_key = get_openmind_api_key()
-                if not api_key:
-                    await ws.send_json(
-                        {
-                            "type": "error",
-                            "error": "Chat disabled: set OM_API_KEY on the executor machine.",
-                        }
-                    )
-                    continue
-
-                # Minimal OpenAI-compatible body; you can expand this to match your config.
-                body = {
-                    "model": obj.get("model") or "gpt-4.1-mini",
-                    "messages": [
-                        {"role": "system", "content": obj.get("system") or "You are a helpful robot."},
-                        {"role": "user", "content": text},
-                    ],
-                }
-                result = await chat_completions(api_key=api_key, body=body)
-                await ws.send_json({"type": "openmind_result", "result": result})
-
-                # Best-effort extract assistant text
-                assistant_text = ""
+            message = await ws.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            # Text frames arrive already decoded; binary frames are parsed as bytes and
+            # only decoded below if they turn out not to be a JSON command.
+            frame = message.get("text")
+            if frame is None:
+                frame = message.get("bytes") or b""
+
+            # Allow either raw text (speak) or JSON messages. Only objects can be
+            # commands, so plain sentences skip the parse attempt entirely.
+            obj = None
+            if frame.lstrip()[:1] in ("{", b"{"):
                 try:
-                    assistant_text = (
-                        result["data"]["choices"][0]["message"]["content"]  # type: ignore[index]
-                    )
-                except Exception:
-                    assistant_text = json.dumps(result["data"])
-
-                if assistant_text:
-                    speak(assistant_text)
-                    await ws.send_json({"type": "spoken", "text": assistant_text})
-                continue
+                    obj = json_loads(frame)
+                except ValueError:
+                    pass
+
+            if isinstance(obj, dict):
+                msg_type = obj.get("type")
+                handler = _WS_JSON_HANDLERS.get(msg_type) if isinstance(msg_type, str) else None
+                if handler is not None:
+                    await handler(ws, obj)
+                    continue
 
             # Default: speak what you typed
+            msg = frame if isinstance(frame, str) else frame.decode("utf-8", errors="replace")
             text = msg.strip()
             if not text:
                 continue
@@ -556,14 +712,19 @@ async def ws_conversation(ws: WebSocket):
             # ---- Chinese conversational control for chain transfers ----
             if text in ("取消", "算了", "不转了", "撤销"):
                 pending_chain_payload = None
-                await ws.send_json({"type": "cancelled", "message": "已取消。"})
+                await _ws_send_json(ws, {"type": "cancelled", "message": "已取消。"})
                 continue
 
             if text in ("确认", "确定", "是", "yes", "y") and pending_chain_payload:
-                times = int(pending_chain_payload.get("times") or 1)
+                # The pending payload is ours and is dropped after this batch, so take
+                # "times" out in place and send the same dict for every transfer.
+                payload = pending_chain_payload
+                pending_chain_payload = None
+                times = int(payload.pop("times", None) or 1)
                 times = max(1, min(times, 50))  # avoid accidental huge batches
 
-                await ws.send_json(
+                await _ws_send_json(
+                    ws,
                     {
                         "type": "info",
                         "message": f"已确认，准备提交 {times} 笔交易…",
@@ -572,22 +733,20 @@ async def ws_conversation(ws: WebSocket):
                 )
 
                 # Execute sequentially for nonce safety.
-                base = dict(pending_chain_payload)
-                base.pop("times", None)
                 results = []
                 for i in range(times):
-                    await ws.send_json({"type": "progress", "index": i + 1, "total": times})
-                    r = await chain_execute(base)
+                    await ws.send_text(_WS_PROGRESS_TEMPLATE.format(i + 1, times))
+                    r = await chain_execute(payload)
                     results.append(r)
-                    await ws.send_json({"type": "chain_result", "index": i + 1, "total": times, "result": r})
+                    await _ws_send_json(ws, {"type": "chain_result", "index": i + 1, "total": times, "result": r})
 
-                pending_chain_payload = None
-                await ws.send_json({"type": "done", "count": times, "results_count": len(results)})
+                await _ws_send_json(ws, {"type": "done", "count": times, "results_count": len(results)})
                 continue
 
             parsed = _parse_cn_transfer(text)
             if parsed and parsed.get("_needs_token"):
-                await ws.send_json(
+                await _ws_send_json(
+                    ws,
                     {
                         "type": "need_more",
                         "message": "我识别到了金额和收款地址，但没看到币种。请说：转 X USDC 到 0x... 或 转 X ETH 到 0x...",
@@ -601,7 +760,8 @@ async def ws_conversation(ws: WebSocket):
                 pending_chain_payload = parsed
                 if parsed["type"] == "transfer_erc20":
                     times = int(parsed.get("times") or 1)
-                    await ws.send_json(
+                    await _ws_send_json(
+                        ws,
                         {
                             "type": "confirm",
                             "message": f"确认转账：向 {parsed['to']} 转 {parsed['amount']} USDC（测试网），共 {times} 次。回复“确认”执行，回复“取消”放弃。",
@@ -610,7 +770,8 @@ async def ws_conversation(ws: WebSocket):
                     )
                 else:
                     times = int(parsed.get("times") or 1)
-                    await ws.send_json(
+                    await _ws_send_json(
+                        ws,
                         {
                             "type": "confirm",
                             "message": f"确认转账：向 {parsed['to']} 转 {parsed['amount_eth']} ETH（测试网），共 {times} 次。回复“确认”执行，回复“取消”放弃。",
@@ -621,7 +782,7 @@ async def ws_conversation(ws: WebSocket):
 
             # Otherwise treat as "speak"
             speak(text)
-            await ws.send_json({"type": "spoken", "text": text})
+            await ws.send_text(_ws_spoken_frame(text))
     except WebSocketDisconnect:
         return
 
@@ -1,16 +1,40 @@
-import os
 from typing import Any, Dict, Optional
 
 import httpx
 
+from config import CFG
+from jsonutil import dumps as json_dumps, loads as json_loads
 
-def _chain_service_url() -> str:
-    return (os.getenv("CHAIN_SERVICE_URL") or "http://127.0.0.1:8790").rstrip("/")
 
+# Shared across requests so batched transfers reuse one keep-alive connection
+# instead of reconnecting for every call. Managed by the app's startup/shutdown hooks.
+_client: Optional[httpx.AsyncClient] = None
 
-def _chain_service_secret() -> Optional[str]:
-    v = os.getenv("CHAIN_SERVICE_SHARED_SECRET")
-    return v if v else None
+_CHAIN_EXECUTE_URL = f"{CFG.chain_service_url}/execute"
+_CHAIN_HEADERS: Dict[str, str] = {"content-type": "application/json"}
+if CFG.chain_service_secret:
+    _CHAIN_HEADERS["x-chain-secret"] = CFG.chain_service_secret
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=60.0,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        )
+    return _client
+
+
+async def start_chain_client() -> None:
+    _get_client()
+
+
+async def close_chain_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
 
 async def chain_execute(payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -22,18 +46,9 @@ async def chain_execute(payload: Dict[str, Any]) -> Dict[str, Any]:
       - CHAIN_SERVICE_SHARED_SECRET: if set, sent as header x-chain-secret
     """
 
-    url = f"{_chain_service_url()}/execute"
-    headers: Dict[str, str] = {"content-type": "application/json"}
-    secret = _chain_service_secret()
-    if secret:
-        headers["x-chain-secret"] = secret
-
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        r = await client.post(url, headers=headers, json=payload)
-        try:
-            data = r.json()
-        except Exception:
-            data = {"raw": r.text}
-        return {"status": r.status_code, "data": data}
-
-
+    r = await _get_client().post(_CHAIN_EXECUTE_URL, headers=_CHAIN_HEADERS, content=json_dumps(payload))
+    try:
+        data = json_loads(r.content)
+    except Exception:
+        data = {"raw": r.text}
+    return {"status": r.status_code, "data": data}
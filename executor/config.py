@@ -0,0 +1,51 @@
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """
+    Executor settings, read from the environment once at startup.
+
+    See README.md for what each variable does.
+    """
+
+    executor_shared_secret: str
+    executor_chain_local_token: str
+    enable_chain_from_gateway: bool
+    default_rpc_url: str
+    default_chain_id: int
+    default_usdc_address: str
+    x402_state_path: str
+    chain_service_url: str
+    chain_service_secret: Optional[str]
+    openmind_api_key: Optional[str]
+    chat_cache_size: int
+    tts_mode: str
+
+
+def load_config() -> Config:
+    return Config(
+        executor_shared_secret=os.getenv("EXECUTOR_SHARED_SECRET", ""),
+        executor_chain_local_token=os.getenv("EXECUTOR_CHAIN_LOCAL_TOKEN", ""),
+        enable_chain_from_gateway=(os.getenv("EXECUTOR_ENABLE_CHAIN_FROM_GATEWAY") or "false").lower()
+        in ("1", "true", "yes"),
+        default_rpc_url=(os.getenv("DEFAULT_RPC_URL") or "https://rpc.testnet.arc.network").strip(),
+        default_chain_id=int(os.getenv("DEFAULT_CHAIN_ID") or "5042002"),
+        default_usdc_address=(
+            os.getenv("DEFAULT_USDC_ADDRESS") or "0x3600000000000000000000000000000000000000"
+        ).strip(),
+        x402_state_path=(
+            os.getenv("X402_STATE_PATH") or str(Path(__file__).resolve().parent / ".x402_sandbox_state.json")
+        ).strip(),
+        chain_service_url=(os.getenv("CHAIN_SERVICE_URL") or "http://127.0.0.1:8790").rstrip("/"),
+        chain_service_secret=os.getenv("CHAIN_SERVICE_SHARED_SECRET") or None,
+        openmind_api_key=os.getenv("OM_API_KEY") or os.getenv("OPENMIND_API_KEY"),
+        chat_cache_size=int(os.getenv("EXECUTOR_CHAT_CACHE_SIZE") or "512"),
+        tts_mode=os.getenv("EXECUTOR_TTS", "print").strip().lower(),
+    )
+
+
+CFG = load_config()
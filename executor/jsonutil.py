@@ -0,0 +1,30 @@
+import json
+from typing import Any, Union
+
+import msgspec
+import orjson
+
+
+def dumps(data: Any, *, sort_keys: bool = False) -> bytes:
+    """
+    Compact UTF-8 JSON (the same format as ws.send_json), encoded with orjson.
+
+    orjson refuses integers beyond 64 bits, which wei and 18-decimal token
+    amounts reach routinely, so such payloads fall back to the stdlib encoder.
+    """
+
+    try:
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS if sort_keys else None)
+    except TypeError:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys).encode("utf-8")
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Parse JSON from str or bytes, keeping integers exact at any size
+    (orjson would silently turn ones beyond 64 bits into floats).
+
+    Raises ValueError for invalid JSON or invalid UTF-8.
+    """
+
+    return msgspec.json.decode(data)
@@ -1,14 +1,66 @@
-import os
-from typing import Any, Dict, Optional
+import hashlib
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 import httpx
+import orjson
+
+from config import CFG
+from jsonutil import dumps as json_dumps
 
 
 DEFAULT_OPENMIND_URL = "https://api.openmind.org/api/core/openai/chat/completions"
 
+# Shared across requests so chat turns reuse the TLS connection (HTTP/2 when
+# the server offers it). Managed by the app's startup/shutdown hooks.
+_client: Optional[httpx.AsyncClient] = None
+
+# Exact-match LRU of successful replies, so replayed debug prompts skip the LLM round trip.
+# EXECUTOR_CHAT_CACHE_SIZE=0 disables it.
+_CHAT_CACHE_SIZE = CFG.chat_cache_size
+_chat_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+
 
 def get_openmind_api_key() -> Optional[str]:
-    return os.getenv("OM_API_KEY") or os.getenv("OPENMIND_API_KEY")
+    return CFG.openmind_api_key
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=60.0,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        )
+    return _client
+
+
+async def start_openmind_client() -> None:
+    _get_client()
+
+
+async def close_openmind_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _chat_cache_key(url: str, api_key: str, body: Dict[str, Any]) -> Optional[bytes]:
+    if _CHAT_CACHE_SIZE <= 0:
+        return None
+    # Sampling with an explicit temperature is expected to vary; don't pin one answer.
+    temperature = body.get("temperature")
+    if isinstance(temperature, (int, float)) and temperature > 0:
+        return None
+    # The API key is hashed in too: a reply fetched with one key must not be served to another.
+    h = hashlib.blake2b(url.encode("utf-8"), digest_size=16)
+    h.update(b"\0")
+    h.update(api_key.encode("utf-8"))
+    h.update(b"\0")
+    h.update(json_dumps(body, sort_keys=True))
+    return h.digest()
 
 
 async def chat_completions(
@@ -18,20 +70,95 @@ async def chat_completions(
     url: str = DEFAULT_OPENMIND_URL,
     timeout_s: float = 60.0,
 ) -> Dict[str, Any]:
-    async with httpx.AsyncClient(timeout=timeout_s) as client:
-        r = await client.post(
-            url,
-            headers={
-                "content-type": "application/json",
-                "authorization": f"Bearer {api_key}",
-            },
-            json=body,
-        )
-        # Return both status + parsed json/text for debugging.
-        try:
-            payload = r.json()
-        except Exception:
-            payload = {"raw": r.text}
-        return {"status": r.status_code, "data": payload}
+    key = _chat_cache_key(url, api_key, body)
+    if key is not None:
+        cached = _chat_cache.get(key)
+        if cached is not None:
+            _chat_cache.move_to_end(key)
+            return cached
+
+    r = await _get_client().post(
+        url,
+        headers={
+            "content-type": "application/json",
+            "authorization": f"Bearer {api_key}",
+        },
+        content=json_dumps(body),
+        timeout=timeout_s,
+    )
+    # Return both status + parsed json/text for debugging.
+    try:
+        payload = orjson.loads(r.content)
+    except Exception:
+        payload = {"raw": r.text}
+    result = {"status": r.status_code, "data": payload}
+
+    if key is not None and r.is_success:
+        _chat_cache[key] = result
+        if len(_chat_cache) > _CHAT_CACHE_SIZE:
+            _chat_cache.popitem(last=False)
+    return result
+
+
+async def chat_completions_stream(
+    *,
+    api_key: str,
+    body: Dict[str, Any],
+    on_text: Callable[[str], Awaitable[None]],
+    url: str = DEFAULT_OPENMIND_URL,
+    timeout_s: float = 60.0,
+) -> Dict[str, Any]:
+    """
+    Like chat_completions, but asks for an SSE stream and awaits on_text(delta)
+    for each piece of assistant content as it arrives, so callers can act before
+    the reply is complete.
+
+    Returns the same {"status", "data"} shape; on success data is an OpenAI-like
+    body holding the joined content. If the server answers with plain JSON
+    instead of a stream, that body is returned as-is and on_text is not called.
+    """
+
+    async with _get_client().stream(
+        "POST",
+        url,
+        headers={
+            "content-type": "application/json",
+            "accept": "text/event-stream",
+            "authorization": f"Bearer {api_key}",
+        },
+        content=json_dumps({**body, "stream": True}),
+        timeout=timeout_s,
+    ) as r:
+        if not r.is_success or not r.headers.get("content-type", "").startswith("text/event-stream"):
+            raw = await r.aread()
+            try:
+                payload = orjson.loads(raw)
+            except Exception:
+                payload = {"raw": r.text}
+            return {"status": r.status_code, "data": payload}
 
+        parts: list[str] = []
+        async for line in r.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            try:
+                event = orjson.loads(data)
+            except orjson.JSONDecodeError:
+                continue
+            choices = event.get("choices") if isinstance(event, dict) else None
+            if not isinstance(choices, list) or not choices or not isinstance(choices[0], dict):
+                continue
+            delta = choices[0].get("delta")
+            text = delta.get("content") if isinstance(delta, dict) else None
+            if isinstance(text, str) and text:
+                parts.append(text)
+                await on_text(text)
 
+    content = "".join(parts)
+    return {
+        "status": r.status_code,
+        "data": {"choices": [{"message": {"role": "assistant", "content": content}}]},
+    }
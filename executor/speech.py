@@ -1,5 +1,17 @@
-import os
+import asyncio
+import platform
+import shutil
 import subprocess
+from typing import Optional
+
+from config import CFG
+
+
+# Resolved once at import instead of on every utterance.
+_MODE = CFG.tts_mode
+_OFF_MODES = ("none", "off", "disabled")
+_SAY_MODES = ("mac_say", "say")
+_SAY_BIN = shutil.which("say") if platform.system() == "Darwin" else None
 
 
 def speak(text: str) -> None:
@@ -9,19 +21,75 @@ def speak(text: str) -> None:
     - macOS: uses `say`
     - otherwise: prints to stdout
 
-    Control with env:
+    Control with env (read once at startup, see config.py):
       EXECUTOR_TTS = "mac_say" | "print" | "none"
     """
 
-    mode = os.getenv("EXECUTOR_TTS", "print").strip().lower()
-    if mode in ("none", "off", "disabled"):
+    if _MODE in _OFF_MODES:
         return
 
-    if mode in ("mac_say", "say") and os.uname().sysname.lower() == "darwin":
+    if _MODE in _SAY_MODES and _SAY_BIN:
         # Non-blocking speech (ok for demo); if you want blocking, remove Popen.
-        subprocess.Popen(["say", text])
+        subprocess.Popen([_SAY_BIN, text])
         return
 
     print(f"[executor:speak] {text}")
 
 
+def speak_many(texts: list[str]) -> None:
+    """
+    Speak several sentences in order.
+
+    With `say`, all sentences go to a single process: one spawn instead of one
+    per sentence, and they play back-to-back instead of overlapping.
+    """
+
+    if _MODE in _OFF_MODES or not texts:
+        return
+
+    if _MODE in _SAY_MODES and _SAY_BIN:
+        subprocess.Popen([_SAY_BIN, "\n".join(texts)])
+        return
+
+    for text in texts:
+        print(f"[executor:speak] {text}")
+
+
+# Sentences queued by speak_in_order(), spoken one `say` process at a time.
+_say_queue: Optional[asyncio.Queue] = None
+_say_worker: Optional[asyncio.Task] = None
+
+
+async def _drain_say_queue(queue: asyncio.Queue) -> None:
+    while True:
+        text = await queue.get()
+        try:
+            proc = await asyncio.create_subprocess_exec(_SAY_BIN, text)
+            await proc.wait()
+        except OSError:
+            # Best-effort like speak(): drop this sentence, keep draining.
+            pass
+
+
+def speak_in_order(text: str) -> None:
+    """
+    Speak text after everything queued before it has finished playing.
+
+    For sentences that arrive one by one (streamed replies): speak() starts a
+    separate `say` per call, so back-to-back calls would overlap. Must be
+    called from the running event loop.
+    """
+
+    global _say_queue, _say_worker
+
+    if _MODE in _OFF_MODES:
+        return
+
+    if not (_MODE in _SAY_MODES and _SAY_BIN):
+        print(f"[executor:speak] {text}")
+        return
+
+    if _say_worker is None or _say_worker.done() or _say_worker.get_loop() is not asyncio.get_running_loop():
+        _say_queue = asyncio.Queue()
+        _say_worker = asyncio.create_task(_drain_say_queue(_say_queue))
+    _say_queue.put_nowait(text)